@@ -4,7 +4,7 @@ This module provides two ways to interact with a small video metadata store:
 - Command-line interface (CLI) for scripted usage
 - Graphical user interface (GUI) built with Tkinter for interactive use
 
-Videos are stored as JSON in `videos.json` (human readable). The GUI will launch
+Videos are stored as JSON Lines in `videos.jsonl` (human readable). The GUI will launch
 when the script is run without a positional command. The CLI preserves the
 original functionality (upload/list/view/delete/search) and includes a `--demo`
 mode that seeds example data and demonstrates operations.
@@ -13,25 +13,82 @@ mode that seeds example data and demonstrates operations.
 from __future__ import annotations
 
 import argparse
+import bisect
 import json
 import os
 import sys
-import time
+from contextlib import contextmanager
 try:
-    import tkinter as tk
-    from tkinter import ttk, messagebox
+    import orjson
 except Exception:
-    tk = None
-    ttk = None
-    messagebox = None
+    orjson = None
+try:
+    import ahocorasick_rs
+except Exception:
+    ahocorasick_rs = None
 from dataclasses import dataclass, asdict, field
-from datetime import datetime
-from typing import List, Optional
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+DB_FILE = "videos.jsonl"
+# compact the log once deletion tombstones exceed this fraction of its lines
+COMPACT_RATIO = 0.3
+
+
+def _format_time(dt: datetime) -> str:
+    # RFC 3339 text for a UTC datetime ("...Z"), the same form orjson writes
+    return dt.isoformat().replace("+00:00", "Z")
+
+
+def _json_default(obj):
+    # stdlib json hook for the datetime values in Video records
+    if isinstance(obj, datetime):
+        return _format_time(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _dumps(obj, pretty: bool = False) -> bytes:
+    # Serialize a Video (or plain dict record) to JSON bytes: a single line
+    # for the store file, or indented for display when pretty is set.
+    # orjson walks dataclasses and formats datetimes natively without an
+    # asdict() copy; fall back to stdlib json otherwise.
+    if orjson is not None:
+        option = orjson.OPT_SERIALIZE_DATACLASS | orjson.OPT_UTC_Z
+        if pretty:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, option=option)
+    if not isinstance(obj, dict):
+        obj = asdict(obj)
+    if pretty:
+        return json.dumps(obj, indent=2, default=_json_default).encode("utf-8")
+    return json.dumps(obj, separators=(",", ":"), default=_json_default).encode("utf-8")
+
 
-DB_FILE = "videos.json"
+def _dump_lines(records) -> bytearray:
+    # Encode records as JSON Lines into one growing buffer. Each record's
+    # bytes are freed once copied in, so peak memory stays at the output plus
+    # one record rather than every encoded record held for a join.
+    buf = bytearray()
+    append = buf.extend
+    for r in records:
+        append(_dumps(r))
+        append(b"\n")
+    return buf
 
 
-@dataclass
+def _loads(buf: bytes):
+    # Parse JSON bytes with orjson when available
+    if orjson is not None:
+        return orjson.loads(buf)
+    return json.loads(buf)
+
+
+# slots=True (Python 3.10+) drops the per-instance __dict__, roughly halving
+# the memory of each Video and speeding up attribute access.
+_DATACLASS_OPTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**_DATACLASS_OPTS)
 class Video:
     """Simple dataclass representing video metadata.
 
@@ -39,89 +96,282 @@ class Video:
     - id: integer identifier assigned by the store
     - title, description, uploader: basic metadata strings
     - tags: list of tag strings
-    - uploaded_at: UTC ISO timestamp string set at creation
+    - uploaded_at: UTC datetime set at creation (stored as an ISO string ending in "Z")
     """
     id: int
     title: str
     description: str
     uploader: str
     tags: List[str] = field(default_factory=list)
-    uploaded_at: str = field(default_factory=lambda: datetime.utcnow().isoformat() + "Z")
+    uploaded_at: datetime = field(default_factory=lambda: datetime.now(tz=timezone.utc))
+
+    def __post_init__(self):
+        # Uploader names and tags repeat across many videos; intern them so
+        # equal values share one string object and compare by identity
+        self.uploader = sys.intern(self.uploader)
+        self.tags = [sys.intern(t) for t in self.tags]
+        if isinstance(self.uploaded_at, str):
+            # Stored records hold the timestamp as text; fromisoformat only
+            # accepts a trailing "Z" from Python 3.11 on
+            self.uploaded_at = datetime.fromisoformat(self.uploaded_at.replace("Z", "+00:00"))
+        if self.uploaded_at.tzinfo is None:
+            self.uploaded_at = self.uploaded_at.replace(tzinfo=timezone.utc)
+
+
+# Parsed stores keyed by (absolute path, mtime_ns, size) so reopening an
+# unchanged file skips the JSON parse. Entries hold the raw records and search
+# blobs by id plus the log's line and tombstone counts; they are never mutated.
+_STORE_CACHE: Dict[Tuple[str, int, int], Tuple[Dict[int, dict], Dict[int, str], int, int]] = {}
+
+
+def _search_text(title: str, description: str, tags: List[str]) -> str:
+    # Lowercased title/description/tags joined by NUL so a query cannot match across fields
+    return (title + "\0" + description + "\0" + "\0".join(tags)).lower()
+
+
+def _cache_key(path: str) -> Tuple[str, int, int]:
+    st = os.stat(path)
+    return (os.path.abspath(path), st.st_mtime_ns, st.st_size)
 
 
 class VideoStore:
-    """Persistent collection of Video objects stored in a JSON file.
+    """Persistent collection of Video objects stored in a JSON-Lines file.
 
     Responsibilities:
-    - load existing videos from disk at startup
-    - save changes to disk after add/delete
+    - load existing videos from disk at startup, building Video objects
+      only when they are first accessed
+    - buffer add/delete changes and append them to disk on flush(),
+      compacting the file when deleted records pile up
     - provide helpers to add/list/get/delete/search videos
     """
     def __init__(self, path: str = DB_FILE):
-        # path to the JSON file used for persistence
+        # path to the JSON-Lines file used for persistence
         self.path = path
-        # in-memory list of Video instances
-        self.videos: List[Video] = []
+        # Video instances keyed by id (dict keeps upload order); None until
+        # the video is built from its record in self._raw
+        self.videos: Dict[int, Optional[Video]] = {}
+        # parsed JSON records of videos not yet built
+        self._raw: Dict[int, dict] = {}
+        # lowercased searchable text per video id, kept in step with self.videos
+        self._search_blob: Dict[int, str] = {}
+        # (joined search text, record start offsets, ids) built on demand by _corpus()
+        self._haystack: Optional[Tuple[str, List[int], List[int]]] = None
+        # records (videos or tombstones) not yet written, and whether there are any
+        self._pending: List[object] = []
+        self._dirty = False
+        # nesting depth of bulk() blocks
+        self._bulk = 0
         # load stored data (if any)
         self._load()
 
     def _load(self):
-        # Load JSON array from file and instantiate Video objects.
-        # If the file does not exist or is invalid, start with an empty list.
-        if not os.path.exists(self.path):
-            self.videos = []
-            return
+        # Read the file (or reuse the cached parse of it) into raw records.
+        # If the file does not exist or is invalid, start with an empty store.
+        # lines in the file / how many of them are tombstones
+        self._lines = 0
+        self._tombstones = 0
+        # True when the file must be fully rewritten before appending to it
+        self._rewrite = False
         try:
-            with open(self.path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-            # Create Video instances from stored dicts
-            self.videos = [Video(**v) for v in data]
-        except Exception:
-            # Any error reading/parsing -> reset to empty store
-            self.videos = []
+            key = _cache_key(self.path)
+        except OSError:
+            return
+        cached = _STORE_CACHE.get(key)
+        if cached is None:
+            try:
+                records = self._parse()
+                blobs = {vid: _search_text(r["title"], r["description"], r.get("tags", ())) for vid, r in records.items()}
+            except Exception:
+                # Any error reading/parsing -> reset to empty store
+                self._lines = self._tombstones = 0
+                self._rewrite = True
+                return
+            if not self._rewrite:
+                _STORE_CACHE[key] = (records, blobs, self._lines, self._tombstones)
+        else:
+            # File unchanged since it was last parsed
+            records, blobs, self._lines, self._tombstones = cached
+        self.videos = dict.fromkeys(records)
+        self._raw = dict(records)
+        self._search_blob = dict(blobs)
+
+    def _parse(self) -> Dict[int, dict]:
+        # Replay the log: each line is a video record or a {"__del__": id}
+        # tombstone. A file holding one JSON array (the old videos.json layout)
+        # is also read and gets rewritten as JSON Lines on the next change.
+        with open(self.path, "rb") as f:
+            buf = f.read()
+        if buf.lstrip().startswith(b"["):
+            self._rewrite = True
+            return {r["id"]: r for r in _loads(buf)}
+        records: Dict[int, dict] = {}
+        lines = buf.splitlines()
+        # A last line without a newline means an append was interrupted (or
+        # the file was edited by hand); rewrite the file before appending.
+        self._rewrite = bool(buf) and not buf.endswith(b"\n")
+        for n, line in enumerate(lines, 1):
+            if not line.strip():
+                continue
+            try:
+                rec = _loads(line)
+            except Exception:
+                if self._rewrite and n == len(lines):
+                    # record cut short by the interrupted write
+                    break
+                raise
+            self._lines += 1
+            if "__del__" in rec:
+                records.pop(rec["__del__"], None)
+                self._tombstones += 1
+            else:
+                records[rec["id"]] = rec
+        return records
+
+    def _video(self, video_id: int) -> Video:
+        # Return the Video for an id, building it from its raw record on first use
+        v = self.videos[video_id]
+        if v is None:
+            v = self.videos[video_id] = Video(**self._raw.pop(video_id))
+        return v
+
+    def _forget(self):
+        # Drop cache entries for this file; they are stale after a write
+        path = os.path.abspath(self.path)
+        for k in [k for k in _STORE_CACHE if k[0] == path]:
+            del _STORE_CACHE[k]
 
     def _save(self):
-        # Write current in-memory list to JSON file (pretty printed)
-        with open(self.path, "w", encoding="utf-8") as f:
-            json.dump([asdict(v) for v in self.videos], f, indent=2)
+        # Rewrite the whole file with one line per current video (drops
+        # tombstones). Written to a temp file and swapped in with os.replace
+        # so a crash mid-write never leaves a truncated store behind.
+        # Videos never accessed are written straight from their raw records.
+        records = [self._raw[vid] if v is None else v for vid, v in self.videos.items()]
+        tmp = self.path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(_dump_lines(records))
+        os.replace(tmp, self.path)
+        self._lines = len(records)
+        self._tombstones = 0
+        self._rewrite = False
+        self._pending.clear()
+        self._dirty = False
+        self._forget()
+
+    def compact(self) -> bool:
+        # Rewrite the file without dead records once tombstones make up more
+        # than COMPACT_RATIO of its lines (counting pending ones).
+        # Return True if it was rewritten.
+        lines = self._lines + len(self._pending)
+        if not self._rewrite and self._tombstones <= COMPACT_RATIO * lines:
+            return False
+        self._save()
+        return True
+
+    def flush(self):
+        # Persist pending changes by appending them to the log (or compacting).
+        # Does nothing when there are no unsaved changes.
+        if not self._dirty or self.compact():
+            return
+        with open(self.path, "ab") as f:
+            f.write(_dump_lines(self._pending))
+        self._lines += len(self._pending)
+        self._pending.clear()
+        self._dirty = False
+        self._forget()
+
+    @contextmanager
+    def bulk(self):
+        # Group a batch of add/delete calls (e.g. a scripted import) so they
+        # are written by a single flush() when the outermost block exits
+        self._bulk += 1
+        try:
+            yield self
+        finally:
+            self._bulk -= 1
+            if not self._bulk:
+                self.flush()
 
     def next_id(self) -> int:
         # Determine next id (1-based incremental)
-        return max((v.id for v in self.videos), default=0) + 1
+        return max(self.videos, default=0) + 1
 
     def add(self, title: str, description: str, uploader: str, tags: Optional[List[str]] = None) -> Video:
-        # Create a new Video object, append to store, persist and return it
+        # Create a new Video object, append to store, mark it unsaved and return it
         vid = Video(id=self.next_id(), title=title, description=description, uploader=uploader, tags=tags or [])
-        self.videos.append(vid)
-        self._save()
+        self.videos[vid.id] = vid
+        self._search_blob[vid.id] = _search_text(vid.title, vid.description, vid.tags)
+        self._haystack = None
+        self._pending.append(vid)
+        self._dirty = True
         return vid
 
     def list(self) -> List[Video]:
-        # Return a copy of the stored videos list
-        return list(self.videos)
+        # Return a list of all stored videos (building any not yet accessed)
+        return [self._video(vid) for vid in self.videos]
 
     def get(self, video_id: int) -> Optional[Video]:
         # Find and return a video by id
-        for v in self.videos:
-            if v.id == video_id:
-                return v
-        return None
+        if video_id not in self.videos:
+            return None
+        return self._video(video_id)
 
     def delete(self, video_id: int) -> bool:
         # Remove a video by id. Return True if deletion happened.
-        before = len(self.videos)
-        self.videos = [v for v in self.videos if v.id != video_id]
-        changed = len(self.videos) != before
-        if changed:
-            self._save()
-        return changed
+        if video_id not in self.videos:
+            return False
+        del self.videos[video_id]
+        self._raw.pop(video_id, None)
+        del self._search_blob[video_id]
+        self._haystack = None
+        self._tombstones += 1
+        self._pending.append({"__del__": video_id})
+        self._dirty = True
+        return True
 
     def search(self, query: str) -> List[Video]:
         # Case-insensitive search across title, description and tags
         q = query.lower()
-        results = [v for v in self.videos if q in v.title.lower() or q in v.description.lower() or any(q in t.lower() for t in v.tags)]
+        if not q or "\x1f" in q:
+            return [self._video(vid) for vid, b in self._search_blob.items() if q in b]
+        # One str.find sweep over the joined corpus; after a hit, resume at the
+        # next record so each video is reported at most once
+        text, starts, ids = self._corpus()
+        results = []
+        pos = text.find(q)
+        while pos != -1:
+            i = bisect.bisect_right(starts, pos) - 1
+            results.append(self._video(ids[i]))
+            if i + 1 == len(starts):
+                break
+            pos = text.find(q, starts[i + 1])
         return results
 
+    def _corpus(self) -> Tuple[str, List[int], List[int]]:
+        # All search blobs joined by a record separator, with the offset where
+        # each record starts and its video id. Rebuilt lazily after changes.
+        if self._haystack is None:
+            starts = []
+            pos = 0
+            for b in self._search_blob.values():
+                starts.append(pos)
+                pos += len(b) + 1
+            self._haystack = ("\x1f".join(self._search_blob.values()), starts, list(self._search_blob))
+        return self._haystack
+
+    def search_any(self, terms: List[str]) -> List[Video]:
+        # Case-insensitive search returning videos that match any of the terms.
+        # With ahocorasick_rs installed all terms are found in one native pass
+        # over the joined corpus instead of per-video substring checks.
+        qs = [t.lower() for t in terms if t]
+        if not qs:
+            return []
+        if ahocorasick_rs is None:
+            return [self._video(vid) for vid, b in self._search_blob.items() if any(q in b for q in qs)]
+        text, starts, ids = self._corpus()
+        ac = ahocorasick_rs.AhoCorasick(qs, matchkind=ahocorasick_rs.MatchKind.LeftmostLongest)
+        hits = {bisect.bisect_right(starts, start) - 1 for _, start, _ in ac.find_matches_as_indexes(text)}
+        return [self._video(ids[i]) for i in sorted(hits)]
+
 
 def parse_args(argv=None):
     p = argparse.ArgumentParser(description="YouTube-like console simulator")
@@ -156,7 +406,7 @@ def cmd_list(store: VideoStore, args: argparse.Namespace):
     print(f"{len(videos)} video(s):")
     for v in videos:
         tags = ", ".join(v.tags) if v.tags else "-"
-        print(f"[{v.id}] {v.title} (by {v.uploader}) tags: {tags} uploaded: {v.uploaded_at}")
+        print(f"[{v.id}] {v.title} (by {v.uploader}) tags: {tags} uploaded: {_format_time(v.uploaded_at)}")
     return 0
 
 
@@ -169,7 +419,7 @@ def cmd_view(store: VideoStore, args: argparse.Namespace):
     if not v:
         print(f"Video id={args.id} not found")
         return 1
-    print(json.dumps(asdict(v), indent=2))
+    print(_dumps(v, pretty=True).decode("utf-8"))
     return 0
 
 
@@ -208,14 +458,15 @@ def run_demo(store: VideoStore):
     # exercises list/search/view/delete to demonstrate functionality.
     print("Running demo: uploading 3 videos, listing, searching, viewing, deleting")
     demos = [
-        {"title": "My First Vlog", "description": "Hello world vlog", "uploader": "alice", "tags": "vlog,intro"},
-        {"title": "Python Tutorial", "description": "Learn Python in 10 minutes", "uploader": "bob", "tags": "python,programming"},
-        {"title": "Relaxing Music", "description": "Lo-fi beats", "uploader": "carol", "tags": "music,lofi"},
+        {"title": "My First Vlog", "description": "Hello world vlog", "uploader": "alice", "tags": ["vlog", "intro"]},
+        {"title": "Python Tutorial", "description": "Learn Python in 10 minutes", "uploader": "bob", "tags": ["python", "programming"]},
+        {"title": "Relaxing Music", "description": "Lo-fi beats", "uploader": "carol", "tags": ["music", "lofi"]},
     ]
-    for d in demos:
-        args = argparse.Namespace(title=d["title"], description=d["description"], uploader=d["uploader"], tags=d["tags"])
-        cmd_upload(store, args)
-        time.sleep(0.1)
+    # Add directly instead of round-tripping each upload through argparse
+    with store.bulk():
+        for d in demos:
+            v = store.add(**d)
+            print(f"Uploaded video: id={v.id} title='{v.title}' uploader='{v.uploader}'")
     print()
     cmd_list(store, argparse.Namespace())
     print()
@@ -233,43 +484,51 @@ def run_demo(store: VideoStore):
 
 def main(argv=None):
     args = parse_args(argv)
-    store = VideoStore()
-
     if args.demo:
-        # ensure fresh state for demo
+        # ensure fresh state for demo before the store is loaded, so the
+        # old file is never parsed just to be thrown away
         try:
-            if os.path.exists(store.path):
-                os.remove(store.path)
-        except Exception:
+            os.remove(DB_FILE)
+        except OSError:
             pass
-        store = VideoStore()
-        run_demo(store)
-        return 0
-
-    # If no command provided, launch GUI (if available)
-    if not args.command:
-        if tk is None:
-            print("Tkinter is not available; please provide a command or install Tkinter.")
-            return 2
-        launch_gui(store)
-        return 0
+    store = VideoStore()
 
-    cmd = args.command
-    if cmd == "upload":
-        return cmd_upload(store, args)
-    if cmd == "list":
-        return cmd_list(store, args)
-    if cmd == "view":
-        return cmd_view(store, args)
-    if cmd == "delete":
-        return cmd_delete(store, args)
-    if cmd == "search":
-        return cmd_search(store, args)
-    print("Unknown command")
-    return 2
+    try:
+        if args.demo:
+            run_demo(store)
+            return 0
+
+        # If no command provided, launch GUI (if available)
+        if not args.command:
+            return launch_gui(store)
+
+        cmd = args.command
+        if cmd == "upload":
+            return cmd_upload(store, args)
+        if cmd == "list":
+            return cmd_list(store, args)
+        if cmd == "view":
+            return cmd_view(store, args)
+        if cmd == "delete":
+            return cmd_delete(store, args)
+        if cmd == "search":
+            return cmd_search(store, args)
+        print("Unknown command")
+        return 2
+    finally:
+        # write out any changes made by the command before exiting
+        store.flush()
 
 
 def launch_gui(store: VideoStore):
+    # tkinter is imported here rather than at module level so CLI commands
+    # don't pay for loading it (and Tcl/Tk) on every run
+    try:
+        import tkinter as tk
+        from tkinter import ttk, messagebox
+    except Exception:
+        print("Tkinter is not available; please provide a command or install Tkinter.")
+        return 2
     root = tk.Tk()
     root.title("YouTube-like Simulator")
     root.geometry("700x450")
@@ -337,11 +596,14 @@ def launch_gui(store: VideoStore):
     tree.pack(fill=tk.BOTH, expand=True)
 
     def refresh_list(items: Optional[List[Video]] = None):
-        for i in tree.get_children():
-            tree.delete(i)
+        # Clear all rows in a single Tcl call, then build the row tuples up front
+        children = tree.get_children()
+        if children:
+            tree.delete(*children)
         items = items if items is not None else store.list()
-        for v in items:
-            tree.insert("", tk.END, values=(v.id, v.title, v.uploader, ", ".join(v.tags) if v.tags else "-", v.uploaded_at))
+        rows = [(v.id, v.title, v.uploader, ", ".join(v.tags) or "-", _format_time(v.uploaded_at)) for v in items]
+        for r in rows:
+            tree.insert("", tk.END, values=r)
 
     def on_view():
         sel = tree.selection()
@@ -354,7 +616,7 @@ def launch_gui(store: VideoStore):
         if not v:
             messagebox.showerror("Error", "Video not found")
             return
-        messagebox.showinfo(f"Video {v.id}", json.dumps(asdict(v), indent=2))
+        messagebox.showinfo(f"Video {v.id}", _dumps(v, pretty=True).decode("utf-8"))
 
     def on_delete():
         sel = tree.selection()
@@ -374,7 +636,14 @@ def launch_gui(store: VideoStore):
     ttk.Button(btns, text="Refresh", command=refresh_list).pack(side=tk.LEFT, padx=4)
 
     refresh_list()
+    def on_close():
+        # persist unsaved changes before the window goes away
+        store.flush()
+        root.destroy()
+
+    root.protocol("WM_DELETE_WINDOW", on_close)
     root.mainloop()
+    return 0
 
 
 if __name__ == "__main__":